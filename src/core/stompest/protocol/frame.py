@@ -50,8 +50,11 @@ class StompFrame(object):
     {'some french': 'fenêtre'}
     
     """
+    __slots__ = ('command', 'body', 'rawHeaders', '_headers', '_version', '_encode')
+
     INFO_LENGTH = 20
     _KEYWORDS_AND_FIELDS = [('headers', '_headers', {}), ('body', 'body', b''), ('rawHeaders', 'rawHeaders', None), ('version', 'version', StompSpec.DEFAULT_VERSION)]
+    _ENCODERS = {} # per-codec encoder cache (codec -> encode function), shared by all frames
 
     def __init__(self, command, headers=None, body=b'', rawHeaders=None, version=None):
         self.version = version
@@ -122,7 +125,10 @@ class StompFrame(object):
     def version(self, value):
         self._version = version = StompSpec.version(value)
         codec = StompSpec.codec(version)
-        self._encode = lambda text: text.encode(codec)
+        try:
+            self._encode = self._ENCODERS[codec]
+        except KeyError:
+            self._encode = self._ENCODERS.setdefault(codec, lambda text: text.encode(codec))
 
     def unraw(self):
         """If the frame has raw headers, copy their deduplicated version to the :attr:`headers` attribute, and remove the raw headers afterwards."""
@@ -1,5 +1,4 @@
-import collections
-import re
+import sys
 
 from stompest.error import StompFrameError
 
@@ -7,6 +6,13 @@ from stompest.protocol.frame import StompFrame, StompHeartBeat
 from stompest.protocol.spec import StompSpec
 from stompest.protocol.util import unescape
 
+try:
+    _intern = sys.intern
+except AttributeError: # Python 2
+    _intern = intern # @UndefinedVariable
+
+_CONTENT_LENGTH_HEADER = StompSpec.CONTENT_LENGTH_HEADER # hoisted: saves the StompSpec attribute walk per frame
+
 class StompParser(object):
     """This is a parser for a wire-level byte-stream of STOMP frames.
     
@@ -37,7 +43,11 @@ class StompParser(object):
     """
     SENTINEL = None
 
+    _COMPACT_SIZE = 1 << 16 # consumed prefix size (in bytes) beyond which the buffer is always compacted
+
     _LINE_DELIMITER = ord(StompSpec.LINE_DELIMITER.encode())
+    _LINE_DELIMITER_BYTES = StompSpec.LINE_DELIMITER.encode()
+    _HEADER_SEPARATOR_BYTES = StompSpec.HEADER_SEPARATOR.encode()
     _FRAME_DELIMITER = StompSpec.FRAME_DELIMITER.encode()
 
     def __init__(self, version=None):
@@ -53,31 +63,69 @@ class StompParser(object):
         self._data += data
         while self._parse():
             pass
+        self._compact()
 
     def canRead(self):
         """Indicates whether there are frames available.
         """
-        return bool(self._frames)
+        return self._framesHead < len(self._frames)
 
     def get(self):
         """Return the next frame as a :class:`~.frame.StompFrame` object (if any), or :obj:`None` (otherwise).
         """
-        if self.canRead():
-            return self._frames.popleft()
-        return self.SENTINEL
+        # frames are buffered in a plain list behind an advancing head index
+        # (same read-cursor scheme as the byte buffer): no per-frame popleft
+        frames = self._frames
+        head = self._framesHead
+        if head == len(frames):
+            return self.SENTINEL
+        frame = frames[head]
+        head += 1
+        if head == len(frames): # drained: reclaim the consumed prefix for free
+            del frames[:]
+            head = 0
+        elif (head > 64) and (head > (len(frames) >> 1)): # never let the dead prefix dominate
+            del frames[:head]
+            head = 0
+        self._framesHead = head
+        return frame
+
+    def drain(self):
+        """Return all available frames at once as a :class:`list` (which may be empty), and remove them from the parser. One :meth:`drain` replaces a Python-level :meth:`get` call per frame when a chunk of wire data holds several frames.
+        """
+        head = self._framesHead
+        frames = self._frames[head:] if head else self._frames
+        self._frames = []
+        self._framesHead = 0
+        return frames
 
     def reset(self):
         """Reset internal state, including all fully or partially parsed frames.
         """
-        self._frames = collections.deque()
+        self._frames = []
+        self._framesHead = 0
         self._flush()
 
     def _append(self):
         self._frames.append(self._frame)
         self._next()
 
+    def _compact(self):
+        # drop the consumed prefix, but only when the copy is cheap (the tail is at
+        # most as long as the prefix) or the dead prefix has grown large
+        offset = self._offset
+        if (offset <= self._COMPACT_SIZE) and (offset <= (len(self._data) >> 1)):
+            return
+        del self._data[:offset]
+        self._seek -= offset
+        self._start -= offset
+        if self._eof is not None:
+            self._eof -= offset
+        self._offset = 0
+
     def _flush(self):
-        self._truncate(len(self._data))
+        del self._data[:]
+        self._offset = self._seek = self._start = 0
         self._next()
 
     def _next(self):
@@ -88,7 +136,11 @@ class StompParser(object):
             return
 
         if self._frame is None:
-            return self._parseHeartBeat() or self._parseHead()
+            # one indexed byte load decides heart-beat vs. head, so the busy-connection
+            # common path (a command letter first) pays no extra method call
+            if self._data[self._start] == self._LINE_DELIMITER:
+                return self._parseHeartBeat()
+            return self._parseHead()
 
         return self._parseEndOfFrame() and self._parseBody()
 
@@ -101,6 +153,9 @@ class StompParser(object):
         return True
 
     def _parseEndOfFrame(self):
+        # when content-length was given, _parseHead has already pinned _eof and the
+        # scan below is skipped entirely -- the body may legitimately contain NUL
+        # bytes, and a buffer-wide find would be wasted work
         if self._eof is None:
             eof = self._data.find(self._FRAME_DELIMITER, self._seek)
             if eof == -1:
@@ -113,39 +168,56 @@ class StompParser(object):
         return True
 
     def _parseHead(self):
-        try:
-            endOfHead = self._findHead(self._data, self._start).end()
-        except AttributeError:
+        # bytes.find on the literal terminator(s) dispatches to C memmem -- much
+        # cheaper than running the regex engine over the buffer on every attempt
+        endOfHead = -1
+        for terminator in self._headTerminators:
+            index = self._data.find(terminator, self._start)
+            if index != -1:
+                end = index + len(terminator)
+                if (endOfHead == -1) or (end < endOfHead):
+                    endOfHead = end
+        if endOfHead == -1:
             return
-        command, rawHeaders = None, []
-        for line in self._data[self._start:endOfHead].decode(self._codec).split(StompSpec.LINE_DELIMITER):
-            if line[-1:] == self._stripLineDelimiter:
-                line = line[:-1]
-            if command is None:
-                command = line
-                if command not in self._commands:
-                    self._raise('Invalid command (version %s): %r' % (self.version, command))
-                _unescape = unescape(self.version, command)
-                continue
-            if not line:
-                break
-            try:
-                name, value = line.split(StompSpec.HEADER_SEPARATOR, 1)
-            except ValueError:
-                self._raise('No separator in header line: %r' % line)
-            rawHeaders.append((_unescape(name), _unescape(value)))
-        self._frame = StompFrame(command=command, rawHeaders=rawHeaders, version=self.version)
+        # split the raw bytes and decode header names and values individually:
+        # decoding the whole head up front would allocate (and UTF-8 validate) one
+        # large intermediate str per frame
+        codec = self._codec
+        lines = memoryview(self._data)[self._start:endOfHead].tobytes().split(self._LINE_DELIMITER_BYTES)
+        strip = self._stripLineDelimiterBytes
+        if strip:
+            lines = [line[:-1] if line[-1:] == strip else line for line in lines]
+        # resolve the command on the raw bytes: validates it, skips a decode and
+        # yields the interned str, so downstream comparisons are pointer-equal
+        command = self._commandsByBytes.get(lines[0])
+        if command is None:
+            self._raise('Invalid command (version %s): %r' % (self.version, lines[0].decode(codec, 'replace')))
+        _unescape = self._unescapers[command]
+        try: # the head always closes with an empty line; anything after it is ignored
+            count = lines.index(b'', 1) - 1
+        except ValueError:
+            count = len(lines) - 1
+        rawHeaders = [None] * count # pre-sized: appending would re-grow the list in steps
+        separator = self._HEADER_SEPARATOR_BYTES
+        headerNames = self._headerNamesByBytes
+        for j in range(count):
+            line = lines[j + 1]
+            # find + two slices instead of split: no intermediate list per header line
+            i = line.find(separator)
+            if i == -1:
+                self._raise('No separator in header line: %r' % line.decode(codec, 'replace'))
+            name = headerNames.get(line[:i]) or line[:i].decode(codec) # standard header names: interned, no decode
+            rawHeaders[j] = (_unescape(name), _unescape(line[i + 1:].decode(codec)))
+        self._frame = StompFrame(command, None, b'', rawHeaders, self.version) # positional: skips kwargs handling on the per-frame path
         self._start = endOfHead
         try:
-            self._eof = self._seek = self._start + int(self._frame.headers[StompSpec.CONTENT_LENGTH_HEADER])
+            self._eof = self._seek = self._start + int(self._frame.headers[_CONTENT_LENGTH_HEADER])
         except KeyError:
             pass
         return True
 
     def _parseHeartBeat(self):
-        if self._data[self._start] != self._LINE_DELIMITER:
-            return
-        self._seek = self._start = self._start + 1
+        self._truncate(self._start + 1)
         if self._heartbeat is not None:
             self._frame = self._heartbeat
             self._append()
@@ -156,19 +228,43 @@ class StompParser(object):
         raise StompFrameError(message)
 
     def _truncate(self, position):
-        self._data[:position] = b''
-        self._seek = self._start = 0
+        # consuming data merely advances the read offset: deleting the prefix here
+        # would memmove the entire tail once per frame, which is quadratic over a
+        # burst of small frames arriving in one chunk (_compact reclaims the space)
+        self._offset = self._seek = self._start = position
 
     @property
     def version(self):
         return self._version
 
+    _versionCache = {} # version -> per-version parsing tools, computed once and shared by all parser instances
+
     @version.setter
     def version(self, value):
         self._version = version = StompSpec.version(value)
-        self._heartbeat = None if self._version == StompSpec.VERSION_1_0 else StompHeartBeat()
-        self._commands = StompSpec.COMMANDS[version]
-        self._commandsBodyAllowed = StompSpec.COMMANDS_BODY_ALLOWED[self.version]
-        self._codec = StompSpec.codec(version)
-        self._stripLineDelimiter = StompSpec.STRIP_LINE_DELIMITER.get(version, '')
-        self._findHead = re.compile(2 * ('%s?%s' % (self._stripLineDelimiter, StompSpec.LINE_DELIMITER) if self._stripLineDelimiter else StompSpec.LINE_DELIMITER).encode()).search
+        try:
+            cached = self._versionCache[version]
+        except KeyError:
+            commands = StompSpec.COMMANDS[version]
+            stripLineDelimiter = StompSpec.STRIP_LINE_DELIMITER.get(version, '')
+            # the head ends with two line endings; with an optional carriage return
+            # (STOMP 1.2) the second ending either follows directly or after one \r,
+            # so two literals cover all four \r?\n combinations (their match ends
+            # coincide)
+            terminators = [(2 * StompSpec.LINE_DELIMITER).encode()]
+            if stripLineDelimiter:
+                terminators.append((StompSpec.LINE_DELIMITER + stripLineDelimiter + StompSpec.LINE_DELIMITER).encode())
+            cached = self._versionCache[version] = (
+                None if version == StompSpec.VERSION_1_0 else StompHeartBeat(),
+                commands,
+                frozenset(StompSpec.COMMANDS_BODY_ALLOWED[version]),
+                dict((command, unescape(version, command)) for command in commands),
+                dict((command.encode(), _intern(command)) for command in commands),
+                dict((header.encode(), _intern(header)) for (name, header) in vars(StompSpec).items() if name.endswith('_HEADER')),
+                StompSpec.codec(version),
+                stripLineDelimiter.encode(),
+                tuple(terminators),
+            )
+        (self._heartbeat, self._commands, self._commandsBodyAllowed, self._unescapers,
+         self._commandsByBytes, self._headerNamesByBytes,
+         self._codec, self._stripLineDelimiterBytes, self._headTerminators) = cached
@@ -1,3 +1,5 @@
+from __future__ import unicode_literals
+
 import re
 
 from stompest.error import StompFrameError
@@ -17,40 +19,49 @@ class _HeadersTransformer(object):
         self._version = version
         self._escapedCharacters = StompSpec.ESCAPED_CHARACTERS[version]
         if command in StompSpec.COMMANDS_ESCAPE_EXCLUDED[version]:
-            self._sub = lambda _, text: text
+            self._transform = None
         else:
-            self._sub = re.compile(self._regex).sub
+            self._transform = self._createTransform()
 
     def __call__(self, text):
+        if self._transform is None:
+            return text
         try:
-            return self._sub(self._replace, text)
+            return self._transform(text)
         except Exception as e:
             raise StompFrameError('No escape sequence defined for this character (version %s): %s [text=%s]' % (self._version, e, repr(text)))
 
-    def _replace(self, match):
-        return self._escapeSequences[match.group(1)]
-
 class _HeadersEscaper(_HeadersTransformer):
     _INSTANCES = {} # each class needs its own instance cache
 
-    @property
-    def _escapeSequences(self):
-        return {escapeSequence: '%s%s' % (self._ESCAPE_CHARACTER, character) for (character, escapeSequence) in self._escapedCharacters.items()}
-
-    @property
-    def _regex(self):
-        return '(%s)' % '|'.join(map(re.escape, self._escapeSequences))
+    def _createTransform(self):
+        # escaping is a plain character-for-sequence substitution, so one C-level
+        # str.translate pass replaces the regex alternation with a per-hit callback
+        table = dict((ord(escapeSequence), '%s%s' % (self._ESCAPE_CHARACTER, character)) for (character, escapeSequence) in self._escapedCharacters.items())
+        def transform(text, _table=table):
+            return text.translate(_table)
+        return transform
 
 class _HeadersUnescaper(_HeadersTransformer):
     _INSTANCES = {} # each class needs its own instance cache
 
-    @property
-    def _escapeSequences(self):
-        return {'%s%s' % (self._ESCAPE_CHARACTER, character): escapeSequence for (character, escapeSequence) in self._escapedCharacters.items()}
-
-    @property
-    def _regex(self):
-        return '(%s)' % '|'.join(['%s.' % re.escape(self._ESCAPE_CHARACTER)] + [re.escape(c) for c in self._escapedCharacters.values()])
+    def _createTransform(self):
+        # unescaping doubles as validation: the pattern also matches bare escaped
+        # characters and unknown escape sequences, which the replacement callback
+        # turns into an error -- that rules out a blind translate() here
+        escapeSequences = dict(('%s%s' % (self._ESCAPE_CHARACTER, character), escapeSequence) for (character, escapeSequence) in self._escapedCharacters.items())
+        regex = '(%s)' % '|'.join(['%s.' % re.escape(self._ESCAPE_CHARACTER)] + [re.escape(c) for c in self._escapedCharacters.values()])
+        sub = re.compile(regex).sub
+        # the matchable characters (the escape character is among them): a field
+        # containing none of them is both valid and a no-op for the substitution
+        matchable = frozenset(self._escapedCharacters.values())
+        def replace(match, _escapeSequences=escapeSequences):
+            return _escapeSequences[match.group(1)]
+        def transform(text, _matchable=matchable, _sub=sub, _replace=replace):
+            if _matchable.isdisjoint(text): # common case: nothing to unescape, nothing to reject
+                return text
+            return _sub(_replace, text)
+        return transform
 
 escape = _HeadersEscaper.get
 unescape = _HeadersUnescaper.get
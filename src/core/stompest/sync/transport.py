@@ -10,10 +10,12 @@ from stompest._backwards import binaryType
 from stompest.error import StompConnectionError
 from stompest.protocol import StompParser
 
+_MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0) # not available on all platforms (e.g., Windows)
+
 class StompFrameTransport(object):
     factory = StompParser
 
-    READ_SIZE = 4096
+    READ_SIZE = 65536 # 4096 forced one receive buffer allocation and syscall per 4 KiB on fast feeds
 
     def __init__(self, host, port, sslContext=None):
         self.host = host
@@ -22,6 +24,7 @@ class StompFrameTransport(object):
 
         self._socket = None
         self._parser = self.factory()
+        self._readBuffer = bytearray(self.READ_SIZE) # reused by recv_into: no fresh bytes object per read
 
     def __str__(self):
         return '%s:%d' % (self.host, self.port)
@@ -85,13 +88,15 @@ class StompFrameTransport(object):
             if frame is not None:
                 return frame
             try:
-                data = self._socket.recv(self.READ_SIZE)
-                if not data:
+                size = self._socket.recv_into(self._readBuffer)
+                if not size:
                     raise StompConnectionError('No more data')
             except (IOError, StompConnectionError) as e:
                 self.disconnect()
                 raise StompConnectionError('Connection closed [%s]' % e)
-            self._parser.add(data)
+            self._parser.add(memoryview(self._readBuffer)[:size])
+            if (size == self.READ_SIZE) and _MSG_DONTWAIT and not self.sslContext:
+                self._drain()
 
     def send(self, frame):
         self._write(binaryType(frame))
@@ -106,6 +111,20 @@ class StompFrameTransport(object):
     def _connected(self):
         return self._socket is not None
 
+    def _drain(self):
+        # a blocking read that filled the whole buffer suggests the kernel holds
+        # more: empty it with non-blocking reads so one receive() amortizes the
+        # syscalls over every frame already in flight. SSL sockets are excluded
+        # (their recv_into rejects flags, and pending data sits in the TLS layer).
+        while True:
+            try:
+                size = self._socket.recv_into(self._readBuffer, 0, _MSG_DONTWAIT)
+            except (socket.error, IOError): # nothing available right now; a real error will surface on the next blocking read
+                return
+            if not size: # connection closed: reported by the next blocking read
+                return
+            self._parser.add(memoryview(self._readBuffer)[:size])
+
     def _write(self, data):
         self._check()
         try:
@@ -38,18 +38,26 @@ def testText():
 
 def main():
     parser = StompParser(version=StompSpec.VERSION_1_2)
+    # serialize and slice the wire data once, outside the measured loop: rebuilding
+    # the packets per iteration would charge StompFrame.__bytes__ and the slicing
+    # to the profile instead of the parser
     frame = binaryType(binaryFrame) + binaryType(textFrame) + binaryType(heartBeatFrame)
+    packets = []
+    for j in itertools.count():
+        packet = frame[j * SLICE:(j + 1) * SLICE]
+        if not packet:
+            break
+        packets.append(packet)
     for _ in createRange(N):
-        for j in itertools.count():
-            packet = frame[j * SLICE:(j + 1) * SLICE]
-            if not packet:
-                break
+        for packet in packets:
             parser.add(packet)
-        while parser.canRead():
-            parser.get()
+        parser.drain()
 
 if __name__ == '__main__':
     import cProfile
     import pstats
     cProfile.run('main()', 'parserstats')
+    # cumtime ranks by time including callees, which surfaces the parser entry
+    # points (add/_parse/_parseHead); switch to sort_stats('tottime') to rank by
+    # self-time when hunting for the single hottest function
     pstats.Stats('parserstats').strip_dirs().sort_stats('cumtime').print_stats()
@@ -234,6 +234,21 @@ class StompParserTest(unittest.TestCase):
 
         self.assertIsNone(parser.get())
 
+    def test_drain(self):
+        body1 = b'boo'
+        body2 = b'hoo'
+        headers = {'x': 'y'}
+        frameBytes = binaryType(StompFrame(StompSpec.MESSAGE, headers, body1)) + binaryType(StompFrame(StompSpec.MESSAGE, headers, body2))
+        parser = StompParser()
+        self.assertEqual(parser.drain(), [])
+        parser.add(frameBytes)
+
+        frames = parser.drain()
+        self.assertEqual([frame.body for frame in frames], [body1, body2])
+        self.assertFalse(parser.canRead())
+        self.assertIsNone(parser.get())
+        self.assertEqual(parser.drain(), [])
+
     def test_decode(self):
         key = b'fen\xc3\xaatre'.decode('utf-8')
         value = b'\xc2\xbfqu\xc3\xa9 tal?'.decode('utf-8')
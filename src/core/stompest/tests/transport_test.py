@@ -30,7 +30,11 @@ class StompFrameTransportTest(unittest.TestCase):
         connected.return_value = True
         socket = transport._socket = mock.Mock()
         stream = self._generate_bytes(stream)
-        socket.recv = mock.Mock(wraps=lambda size: makeBytesFromSequence(itertools.islice(stream, size)))
+        def recv_into(buffer, nbytes=0):
+            data = makeBytesFromSequence(itertools.islice(stream, nbytes or len(buffer)))
+            buffer[:len(data)] = data
+            return len(data)
+        socket.recv_into = mock.Mock(wraps=recv_into)
         return transport
 
     def _get_send_mock(self):
@@ -64,7 +68,7 @@ class StompFrameTransportTest(unittest.TestCase):
         transport = self._get_receive_mock(binaryType(frame))
         frame_ = transport.receive()
         self.assertEqual(frame, frame_)
-        self.assertEqual(1, transport._socket.recv.call_count)
+        self.assertEqual(1, transport._socket.recv_into.call_count)
 
         self.assertRaises(StompConnectionError, transport.receive)
         self.assertEqual(transport._socket, None)
@@ -85,7 +89,7 @@ class StompFrameTransportTest(unittest.TestCase):
         self.assertEqual(frame, frame_)
         frame_ = transport.receive()
         self.assertEqual(frame, frame_)
-        self.assertEqual(1, transport._socket.recv.call_count)
+        self.assertEqual(1, transport._socket.recv_into.call_count)
 
         self.assertRaises(StompConnectionError, transport.receive)
         self.assertEqual(transport._socket, None)
@@ -98,7 +102,7 @@ class StompFrameTransportTest(unittest.TestCase):
         transport = self._get_receive_mock(binaryType(frame))
         frame_ = transport.receive()
         self.assertEqual(frame, frame_)
-        self.assertEqual(1, transport._socket.recv.call_count)
+        self.assertEqual(1, transport._socket.recv_into.call_count)
 
         self.assertRaises(StompConnectionError, transport.receive)
         self.assertEqual(transport._socket, None)
@@ -115,13 +119,13 @@ class StompFrameTransportTest(unittest.TestCase):
         self.assertEqual(StompSpec.MESSAGE, frame.command)
         self.assertEqual(headers, frame.headers)
         self.assertEqual(body1, frame.body)
-        self.assertEqual(1, transport._socket.recv.call_count)
+        self.assertEqual(1, transport._socket.recv_into.call_count)
 
         frame = transport.receive()
         self.assertEqual(StompSpec.MESSAGE, frame.command)
         self.assertEqual(headers, frame.headers)
         self.assertEqual(body2, frame.body)
-        self.assertEqual(1, transport._socket.recv.call_count)
+        self.assertEqual(1, transport._socket.recv_into.call_count)
 
         self.assertRaises(StompConnectionError, transport.receive)
         self.assertEqual(transport._socket, None)
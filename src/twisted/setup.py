@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import os
-import sys
 
 from setuptools import setup, find_packages
 
@@ -9,10 +8,6 @@ from stompest import FULL_VERSION
 def read(filename):
     return open(os.path.join(os.path.dirname(__file__), filename)).read()
 
-if (sys.version_info[:2] < (2, 7)) or (sys.version_info[0] == 3 and sys.version_info[:2] < (3, 3)):
-    print('stompest requires Python version 2.7, 3.3 or later (%s detected).' % '.'.join(sys.version_info[:2]))
-    sys.exit(-1)
-
 setup(
     name='stompest.async',
     version=FULL_VERSION,
@@ -27,11 +22,11 @@ setup(
     url='https://github.com/nikipore/stompest',
     include_package_data=True,
     zip_safe=True,
+    python_requires='>=2.7, !=3.0.*, !=3.1.*, !=3.2.*',
     install_requires=[
         'stompest==%s' % FULL_VERSION
         , 'twisted >= 16.4.0'
     ],
-    tests_require=['mock'] if sys.version_info[0] == 2 else [],
     test_suite='stompest.async.tests',
     classifiers=[
         'Development Status :: 5 - Production/Stable',
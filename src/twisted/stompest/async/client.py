@@ -45,6 +45,10 @@ LOG_CATEGORY = __name__
 
 connected = checkattr('_protocol')
 
+# pre-bound StompSpec lookups for the per-frame dispatch path
+_CONNECTED, _ERROR, _MESSAGE, _RECEIPT = StompSpec.CONNECTED, StompSpec.ERROR, StompSpec.MESSAGE, StompSpec.RECEIPT
+_MESSAGE_ID_HEADER = StompSpec.MESSAGE_ID_HEADER
+
 class Stomp(object):
     """An asynchronous STOMP client for the Twisted framework.
 
@@ -67,14 +71,8 @@ class Stomp(object):
 
         self.log = logging.getLogger(LOG_CATEGORY)
 
-        self._handlers = {
-            'MESSAGE': self._onMessage,
-            'CONNECTED': self._onConnected,
-            'ERROR': self._onError,
-            'RECEIPT': self._onReceipt,
-        }
-
-        self._listeners = []
+        self._listeners = ()
+        self._protocol = None
 
     #
     # interface
@@ -83,13 +81,15 @@ class Stomp(object):
         """Add a listener to this client. For the interface definition, cf. :class:`~.async.listener.Listener`. 
         """
         if listener not in self._listeners:
-            self._listeners.append(listener)
+            self._listeners += (listener,)
             listener.onAdd(self)
 
     def remove(self, listener):
-        """Remove a listener from this client. 
+        """Remove a listener from this client.
         """
-        self._listeners.remove(listener)
+        listeners = list(self._listeners)
+        listeners.remove(listener)
+        self._listeners = tuple(listeners)
 
     @property
     def disconnected(self):
@@ -105,27 +105,28 @@ class Stomp(object):
 
     @property
     def _protocol(self):
-        try:
-            protocol = self.__protocol
-        except AttributeError:
-            self._protocol = None
-            return self._protocol
-        if not protocol:
+        protocol = self.__protocol
+        if protocol is None:
             raise StompConnectionError('Not connected')
         return protocol
 
     @_protocol.setter
     def _protocol(self, protocol):
         self.__protocol = protocol
+        # cache the bound send method: sendFrame is the hottest call site and
+        # would otherwise pay for the property plus an attribute lookup per frame
+        self.__send = None if (protocol is None) else protocol.send
 
-    @defer.inlineCallbacks
     def sendFrame(self, frame):
         """Send a raw STOMP frame.
 
         .. note :: If we are not connected, this method, and all other API commands for sending STOMP frames except :meth:`~.async.client.Stomp.connect`, will raise a :class:`~.StompConnectionError`. Use this command only if you have to bypass the :class:`~.StompSession` logic and you know what you're doing!
         """
-        self._protocol.send(frame)
-        yield self._notify(lambda l: l.onSend(self, frame))
+        send = self.__send
+        if send is None:
+            raise StompConnectionError('Not connected')
+        send(frame)
+        return self._notify(lambda l: l.onSend(self, frame))
 
     @property
     def session(self):
@@ -148,11 +149,7 @@ class Stomp(object):
 
         .. seealso :: The :mod:`.protocol.failover` and :mod:`~.protocol.session` modules for the details of subscription replay and failover transport.
         """
-        try:
-            self._protocol
-        except:
-            pass
-        else:
+        if self.__protocol is not None:
             raise StompConnectionError('Already connected')
 
         for listener in self._listenersFactory():
@@ -194,59 +191,53 @@ class Stomp(object):
         finally:
             protocol.loseConnection()
 
-    @connected
-    @defer.inlineCallbacks
     def send(self, destination, body=b'', headers=None, receipt=None):
         """send(destination, body=b'', headers=None, receipt=None)
 
         Send a **SEND** frame.
         """
-        yield self.sendFrame(self.session.send(destination, body, headers, receipt))
+        self._protocol # the getter raises StompConnectionError if we are not connected
+        return self.sendFrame(self.session.send(destination, body, headers, receipt))
 
-    @connected
-    @defer.inlineCallbacks
     def ack(self, frame, receipt=None):
         """ack(frame, receipt=None)
 
         Send an **ACK** frame for a received **MESSAGE** frame.
         """
-        yield self.sendFrame(self.session.ack(frame, receipt))
+        self._protocol # the getter raises StompConnectionError if we are not connected
+        return self.sendFrame(self.session.ack(frame, receipt))
 
-    @connected
-    @defer.inlineCallbacks
     def nack(self, frame, receipt=None):
         """nack(frame, receipt=None)
 
         Send a **NACK** frame for a received **MESSAGE** frame.
         """
-        yield self.sendFrame(self.session.nack(frame, receipt))
+        self._protocol # the getter raises StompConnectionError if we are not connected
+        return self.sendFrame(self.session.nack(frame, receipt))
 
-    @connected
-    @defer.inlineCallbacks
     def begin(self, transaction=None, receipt=None):
         """begin(transaction=None, receipt=None)
 
         Send a **BEGIN** frame to begin a STOMP transaction.
         """
-        yield self.sendFrame(self.session.begin(transaction, receipt))
+        self._protocol # the getter raises StompConnectionError if we are not connected
+        return self.sendFrame(self.session.begin(transaction, receipt))
 
-    @connected
-    @defer.inlineCallbacks
     def abort(self, transaction=None, receipt=None):
         """abort(transaction=None, receipt=None)
 
         Send an **ABORT** frame to abort a STOMP transaction.
         """
-        yield self.sendFrame(self.session.abort(transaction, receipt))
+        self._protocol # the getter raises StompConnectionError if we are not connected
+        return self.sendFrame(self.session.abort(transaction, receipt))
 
-    @connected
-    @defer.inlineCallbacks
     def commit(self, transaction=None, receipt=None):
         """commit(transaction=None, receipt=None)
 
         Send a **COMMIT** frame to commit a STOMP transaction.
         """
-        yield self.sendFrame(self.session.commit(transaction, receipt))
+        self._protocol # the getter raises StompConnectionError if we are not connected
+        return self.sendFrame(self.session.commit(transaction, receipt))
 
     @connected
     @defer.inlineCallbacks
@@ -286,11 +277,17 @@ class Stomp(object):
         yield self._notify(lambda l: l.onFrame(self, frame))
         if not frame:
             defer.returnValue(None)
-        try:
-            handler = self._handlers[frame.command]
-        except KeyError:
+        command = frame.command
+        if command == _MESSAGE:
+            yield self._onMessage(frame)
+        elif command == _RECEIPT:
+            yield self._onReceipt(frame)
+        elif command == _CONNECTED:
+            yield self._onConnected(frame)
+        elif command == _ERROR:
+            yield self._onError(frame)
+        else:
             raise StompFrameError('Unknown STOMP command: %s' % repr(frame))
-        yield handler(frame)
 
     @defer.inlineCallbacks
     def _onConnected(self, frame):
@@ -306,7 +303,7 @@ class Stomp(object):
     @defer.inlineCallbacks
     def _onMessage(self, frame):
         headers = frame.headers
-        messageId = headers[StompSpec.MESSAGE_ID_HEADER]
+        messageId = headers[_MESSAGE_ID_HEADER]
 
         try:
             token = self.session.message(frame)
@@ -332,7 +329,7 @@ class Stomp(object):
     @defer.inlineCallbacks
     def _notify(self, notify):
         failed = None
-        for listener in list(self._listeners):
+        for listener in self._listeners:
             try:
                 yield notify(listener)
             except Exception as e:
@@ -1,7 +1,7 @@
 import logging
 import time
 
-from twisted.internet import defer, reactor, task
+from twisted.internet import defer, reactor
 from twisted.python import failure
 
 from stompest.error import StompConnectionError, StompCancelledError, StompProtocolError
@@ -11,9 +11,23 @@ from stompest.async.util import InFlightOperations, WaitingDeferred, sendToError
 
 LOG_CATEGORY = __name__
 
+# pre-bound StompSpec lookups for the per-message hot path
+_ACK_HEADER = StompSpec.ACK_HEADER
+_MESSAGE_ID_HEADER = StompSpec.MESSAGE_ID_HEADER
+_CLIENT_ACK_MODES = frozenset(StompSpec.CLIENT_ACK_MODES)
+
+_time = time.time
+
+def _cancelTimer(timer):
+    if (timer is not None) and timer.active():
+        timer.cancel()
+    return None
+
 class Listener(object):
     """This base class defines the interface for the handlers of possible asynchronous STOMP connection events. You may implement any subset of these event handlers and add the resulting listener to the :class:`~.async.client.Stomp` connection.
     """
+    __slots__ = () # subclasses declare their instance attributes; no per-instance __dict__
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -57,13 +71,14 @@ class Listener(object):
 class ConnectListener(Listener):
     """Waits for the **CONNECTED** frame to arrive.
     """
+    __slots__ = ('_waiting',)
+
     def onAdd(self, connection): # @UnusedVariable
         self._waiting = None
 
-    @defer.inlineCallbacks
     def onConnect(self, connection, frame, connectedTimeout): # @UnusedVariable
         self._waiting = WaitingDeferred()
-        yield self._waiting.wait(connectedTimeout, StompCancelledError('STOMP broker did not answer on time [timeout=%s]' % connectedTimeout))
+        return self._waiting.wait(connectedTimeout, StompCancelledError('STOMP broker did not answer on time [timeout=%s]' % connectedTimeout))
 
     def onConnected(self, connection, frame): # @UnusedVariable
         connection.remove(self)
@@ -79,6 +94,8 @@ class ConnectListener(Listener):
 
 class ErrorListener(Listener):
     """Handles **ERROR** frames."""
+    __slots__ = ()
+
     def onError(self, connection, frame):
         reason = StompProtocolError('Received %s' % frame.info())
         reason.frame = frame
@@ -89,6 +106,8 @@ class ErrorListener(Listener):
 
 class DisconnectListener(Listener):
     """Handles graceful disconnect."""
+    __slots__ = ('log', '_disconnecting', '__disconnectReason')
+
     def __init__(self):
         self.log = logging.getLogger(LOG_CATEGORY)
 
@@ -98,7 +117,7 @@ class DisconnectListener(Listener):
         connection.disconnected = defer.Deferred()
 
     def onConnectionLost(self, connection, reason):
-        self.log.info('Disconnected: %s' % reason.getErrorMessage())
+        self.log.info('Disconnected: %s', reason.getErrorMessage())
         if not self._disconnecting:
             self._disconnectReason = StompConnectionError('Unexpected connection loss [%s]' % reason.getErrorMessage())
 
@@ -106,12 +125,10 @@ class DisconnectListener(Listener):
         connection.session.close(flush=not self._disconnectReason)
 
         if self._disconnectReason:
-            if self.log.isEnabledFor(logging.DEBUG):
-                self.log.debug('Calling disconnected errback: %s' % self._disconnectReason)
+            self.log.debug('Calling disconnected errback: %s', self._disconnectReason)
             connection.disconnected.errback(self._disconnectReason)
         else:
-            if self.log.isEnabledFor(logging.DEBUG):
-                self.log.debug('Calling disconnected callback')
+            self.log.debug('Calling disconnected callback')
             connection.disconnected.callback(None)
 
     def onDisconnect(self, connection, reason, timeout): # @UnusedVariable
@@ -119,12 +136,12 @@ class DisconnectListener(Listener):
         if self._disconnecting:
             return
         self._disconnecting = True
-        self.log.info('Disconnecting ...%s' % ((' [reason=%s]' % reason) if reason else ''))
+        self.log.info('Disconnecting ...%s', (' [reason=%s]' % reason) if reason else '')
 
     def onMessage(self, connection, frame, context): # @UnusedVariable
         if not self._disconnecting:
             return
-        self.log.info('Ignoring message (disconnecting): %s [%s]' % (frame.headers[StompSpec.MESSAGE_ID_HEADER], frame.info()))
+        self.log.info('Ignoring message (disconnecting): %s [%s]', frame.headers[_MESSAGE_ID_HEADER], frame.info())
 
     @property
     def _disconnectReason(self):
@@ -135,7 +152,7 @@ class DisconnectListener(Listener):
         if reason is None:
             self.__disconnectReason = reason
         else:
-            self.log.error('Disconnect because of failure: %s' % reason)
+            self.log.error('Disconnect because of failure: %s', reason)
             if self.__disconnectReason is None:
                 self.__disconnectReason = reason
 
@@ -146,6 +163,8 @@ class ReceiptListener(Listener):
     
     >>> client.add(ReceiptListener(1.0))
     """
+    __slots__ = ('_timeout', '_receipts', 'log')
+
     def __init__(self, timeout=None):
         self._timeout = timeout
         self._receipts = InFlightOperations('Waiting for receipt')
@@ -157,15 +176,22 @@ class ReceiptListener(Listener):
                 continue
             waiting.errback(StompCancelledError('Receipt did not arrive (connection lost)'))
 
-    @defer.inlineCallbacks
     def onSend(self, connection, frame): # @UnusedVariable
         if not frame:
-            defer.returnValue(None)
+            return
         receipt = frame.headers.get(StompSpec.RECEIPT_HEADER)
-        if receipt is None:
-            defer.returnValue(None)
+        if receipt is None: # fire-and-forget fast path: no generator, no Deferred
+            return
+        return self._waitForReceipt(receipt)
+
+    @defer.inlineCallbacks
+    def _waitForReceipt(self, receipt):
+        timeout = self._timeout
+        # the failure is only ever consulted on the timeout branch, so don't pay for
+        # exception construction (and message formatting) when there is no timeout
+        fail = None if (timeout is None) else StompCancelledError('Receipt did not arrive on time: %s [timeout=%s]' % (receipt, timeout))
         with self._receipts(receipt, self.log) as receiptArrived:
-            yield receiptArrived.wait(self._timeout, StompCancelledError('Receipt did not arrive on time: %s [timeout=%s]' % (receipt, self._timeout)))
+            yield receiptArrived.wait(timeout, fail)
 
     def onReceipt(self, connection, frame, receipt): # @UnusedVariable
         self._receipts[receipt].callback(None)
@@ -181,6 +207,8 @@ class SubscriptionListener(Listener):
     .. seealso :: The unit tests in the module :mod:`.tests.async_client_integration_test` cover a couple of usage scenarios.
 
     """
+    __slots__ = ('_handler', '_ack', '_errorDestination', '_onMessageFailed', '_headers', '_ackMode', '_shouldAck', '_inflight', '_drained', 'log')
+
     DEFAULT_ACK_MODE = 'client-individual'
 
     def __init__(self, handler, ack=True, errorDestination=None, onMessageFailed=None):
@@ -191,35 +219,58 @@ class SubscriptionListener(Listener):
         self._errorDestination = errorDestination
         self._onMessageFailed = onMessageFailed or sendToErrorDestination
         self._headers = None
-        self._messages = InFlightOperations('Handler for message')
+        self._ackMode = None
+        self._shouldAck = False
+        self._inflight = 0 # number of outstanding message handlers
+        self._drained = None # Deferred which fires when _inflight drops to 0, created on demand
         self.log = logging.getLogger(LOG_CATEGORY)
 
-    @defer.inlineCallbacks
     def onDisconnect(self, connection, reason, timeout): # @UnusedVariable
         connection.remove(self)
-        if not self._messages:
-            defer.returnValue(None)
-        self.log.info('Waiting for outstanding message handlers to finish ... [timeout=%s]' % timeout)
-        yield self._waitForMessages(timeout)
-        self.log.info('All handlers complete. Resuming disconnect ...')
+        if not self._inflight:
+            return
+        self.log.info('Waiting for outstanding message handlers to finish ... [timeout=%s]', timeout)
+
+        def done(result):
+            self.log.info('All handlers complete. Resuming disconnect ...')
+            return result
+
+        return self._waitForMessages(timeout).addCallback(done)
 
-    @defer.inlineCallbacks
     def onMessage(self, connection, frame, context):
         """onMessage(connection, frame, context)
-        
+
         Handle a message originating from this listener's subscription."""
         if context is not self:
             return
-        with self._messages(frame.headers[StompSpec.MESSAGE_ID_HEADER], self.log) as waiting:
-            try:
-                yield self._handler(connection, frame)
-            except Exception as e:
-                yield self._onMessageFailed(connection, e, frame, self._errorDestination)
-            finally:
-                if self._ack and (self._headers[StompSpec.ACK_HEADER] in StompSpec.CLIENT_ACK_MODES):
-                    yield connection.ack(frame)
-                if not waiting.called:
-                    waiting.callback(None)
+        self._inflight += 1
+        d = defer.maybeDeferred(self._handler, connection, frame)
+        d.addErrback(self._onHandlerFailed, connection, frame)
+        d.addBoth(self._finishMessage, connection, frame)
+        return d
+
+    def _onHandlerFailed(self, failed, connection, frame):
+        return defer.maybeDeferred(self._onMessageFailed, connection, failed.value, frame, self._errorDestination)
+
+    def _finishMessage(self, result, connection, frame):
+        # the equivalent of the old finally clause: ack if configured, then release
+        # this message's in-flight slot -- an ack failure supersedes the handler
+        # outcome, just like an exception raised from a finally block would
+        if self._shouldAck:
+            acked = defer.maybeDeferred(connection.ack, frame)
+        else:
+            acked = None
+
+        def release(ackResult):
+            self._inflight -= 1
+            drained = self._drained
+            if (not self._inflight) and (drained is not None):
+                self._drained = None
+                if not drained.called:
+                    drained.callback(None)
+            return ackResult if isinstance(ackResult, failure.Failure) else result
+
+        return release(None) if (acked is None) else acked.addBoth(release)
 
     def onSubscribe(self, connection, frame, context): # @UnusedVariable
         """Set the **ack** header of the **SUBSCRIBE** frame initiating this listener's subscription to the value of the class atrribute :attr:`DEFAULT_ACK_MODE` (if it isn't set already). Keep a copy of the headers for handling messages originating from this subscription."""
@@ -227,18 +278,22 @@ class SubscriptionListener(Listener):
             return
         if self._headers is not None: # already subscribed
             return
-        frame.headers.setdefault(StompSpec.ACK_HEADER, self.DEFAULT_ACK_MODE)
-        self._headers = frame.headers
+        headers = frame.headers
+        if _ACK_HEADER not in headers:
+            headers[_ACK_HEADER] = self.DEFAULT_ACK_MODE
+        self._headers = headers
+        self._ackMode = ackMode = headers[_ACK_HEADER]
+        # decided once per subscription instead of once per message
+        self._shouldAck = self._ack and (ackMode in _CLIENT_ACK_MODES)
 
-    @defer.inlineCallbacks
     def onUnsubscribe(self, connection, frame, context): # @UnusedVariable
         """onUnsubscribe(connection, frame, context)
-        
+
         Forget everything about this listener's subscription and unregister from the **connection**."""
         if context is not self:
             return
         connection.remove(self)
-        yield self._waitForMessages(None)
+        return self._waitForMessages(None)
 
     def onConnectionLost(self, connection, reason): # @UnusedVariable
         """onConnectionLost(connection, reason)
@@ -247,7 +302,11 @@ class SubscriptionListener(Listener):
         connection.remove(self)
 
     def _waitForMessages(self, timeout):
-        return task.cooperate(handler.wait(timeout, StompCancelledError('Handlers did not finish in time.')) for handler in list(self._messages.values())).whenDone()
+        if not self._inflight:
+            return defer.succeed(None)
+        if self._drained is None:
+            self._drained = WaitingDeferred()
+        return self._drained.wait(timeout, StompCancelledError('Handlers did not finish in time.'))
 
 class HeartBeatListener(Listener):
     """Handles heart-beating.
@@ -255,17 +314,23 @@ class HeartBeatListener(Listener):
     :param thresholds: tolerance thresholds (relative to the negotiated heart-beat periods). The default :obj:`None` is equivalent to the content of the class atrribute :attr:`DEFAULT_HEART_BEAT_THRESHOLDS`. Example: ``{'client': 0.6, 'server' 2.5}`` means that the client will send a heart-beat if it had shown no activity for 60 % of the negotiated client heart-beat period and that the client will disconnect if the server has shown no activity for 250 % of the negotiated server heart-beat period.
 
     """
+    __slots__ = ('_thresholds', '_clientTimer', '_serverTimer', '_callLater')
+
     DEFAULT_THRESHOLDS = {'client': 0.8, 'server': 2.0}
 
     def __init__(self, thresholds=None):
         self._thresholds = thresholds or self.DEFAULT_THRESHOLDS
-        self._heartBeats = {}
+        self._clientTimer = None
+        self._serverTimer = None
+        self._callLater = reactor.callLater # bound once: skips the module and attribute lookups on every beat # @UndefinedVariable
 
     def onConnected(self, connection, frame): # @UnusedVariable
-        self._beats(connection)
+        self._beatClient(connection)
+        self._beatServer(connection)
 
     def onConnectionLost(self, connection, reason): # @UnusedVariable
-        self._beats(None)
+        self._clientTimer = _cancelTimer(self._clientTimer)
+        self._serverTimer = _cancelTimer(self._serverTimer)
         connection.remove(self)
 
     def onFrame(self, connection, frame): # @UnusedVariable
@@ -274,36 +339,46 @@ class HeartBeatListener(Listener):
     def onSend(self, connection, frame): # @UnusedVariable
         connection.session.sent()
 
-    def _beats(self, connection):
-        for which in ('client', 'server'):
-            self._beat(connection, which)
-
-    def _beat(self, connection, which):
-        try:
-            self._heartBeats.pop(which).cancel()
-        except:
-            pass
-        if not connection:
+    def _beatClient(self, connection):
+        session = connection.session
+        remaining = self._clientBeatRemaining(session)
+        if remaining < 0:
+            self._clientTimer = _cancelTimer(self._clientTimer)
             return
-        remaining = self._beatRemaining(connection.session, which)
+        if not remaining:
+            connection.sendFrame(session.beat())
+            remaining = self._clientBeatRemaining(session)
+        timer = self._clientTimer
+        if (timer is not None) and timer.active():
+            timer.reset(remaining) # reuse the live DelayedCall instead of cancel + re-heapify
+        else:
+            self._clientTimer = self._callLater(remaining, self._beatClient, connection)
+
+    def _beatServer(self, connection):
+        remaining = self._serverBeatRemaining(connection.session)
         if remaining < 0:
+            self._serverTimer = _cancelTimer(self._serverTimer)
             return
         if not remaining:
-            if which == 'client':
-                connection.sendFrame(connection.session.beat())
-                remaining = self._beatRemaining(connection.session, which)
-            else:
-                connection.disconnect(reason=StompConnectionError('Server heart-beat timeout'))
-                return
-        self._heartBeats[which] = reactor.callLater(remaining, self._beat, connection, which) # @UndefinedVariable
-
-    def _beatRemaining(self, session, which):
-        heartBeat = {'client': session.clientHeartBeat, 'server': session.serverHeartBeat}[which]
+            connection.disconnect(reason=StompConnectionError('Server heart-beat timeout'))
+            return
+        timer = self._serverTimer
+        if (timer is not None) and timer.active():
+            timer.reset(remaining) # reuse the live DelayedCall instead of cancel + re-heapify
+        else:
+            self._serverTimer = self._callLater(remaining, self._beatServer, connection)
+
+    def _clientBeatRemaining(self, session):
+        heartBeat = session.clientHeartBeat
+        if not heartBeat:
+            return -1
+        return max((self._thresholds['client'] * heartBeat / 1000.0) - (_time() - session.lastSent), 0)
+
+    def _serverBeatRemaining(self, session):
+        heartBeat = session.serverHeartBeat
         if not heartBeat:
             return -1
-        last = {'client': session.lastSent, 'server': session.lastReceived}[which]
-        elapsed = time.time() - last
-        return max((self._thresholds[which] * heartBeat / 1000.0) - elapsed, 0)
+        return max((self._thresholds['server'] * heartBeat / 1000.0) - (_time() - session.lastReceived), 0)
 
 def defaultListeners():
     return [ConnectListener(), DisconnectListener(), ErrorListener(), HeartBeatListener()]
@@ -8,6 +8,8 @@ from stompest.protocol import StompFailoverTransport, StompParser
 
 LOG_CATEGORY = __name__
 
+_DEBUG = logging.DEBUG # hoisted: saves the logging module attribute walk per frame
+
 class StompProtocol(Protocol):
     #
     # twisted.internet.Protocol interface overrides
@@ -19,14 +21,18 @@ class StompProtocol(Protocol):
             Protocol.connectionLost(self, reason)
 
     def dataReceived(self, data):
-        self._parser.add(data)
-        for frame in iter(self._parser.get, self._parser.SENTINEL):
-            if self.log.isEnabledFor(logging.DEBUG):
-                self.log.debug('Received %s' % frame.info())
+        parser = self._parser
+        parser.add(data)
+        log = self.log
+        debug = self._isEnabledFor(_DEBUG)
+        onFrame = self._onFrame
+        for frame in parser.drain():
+            if debug:
+                log.debug('Received %s' % frame.info())
             try:
-                self._onFrame(frame)
+                onFrame(frame)
             except Exception as e:
-                self.log.error('Unhandled error in frame handler: %s' % e)
+                log.error('Unhandled error in frame handler: %s' % e)
 
     def __init__(self, onFrame, onConnectionLost):
         self._onFrame = onFrame
@@ -36,6 +42,17 @@ class StompProtocol(Protocol):
         # leave the logger public in case the user wants to override it
         self.log = logging.getLogger(LOG_CATEGORY)
 
+    @property
+    def log(self):
+        return self._log
+
+    @log.setter
+    def log(self, value):
+        self._log = value
+        # the per-frame debug guard calls this bound method directly, skipping the
+        # attribute walk; the setter keeps it in sync when the logger is overridden
+        self._isEnabledFor = value.isEnabledFor
+
     #
     # user interface
     #
@@ -43,7 +60,7 @@ class StompProtocol(Protocol):
         self.transport.loseConnection()
 
     def send(self, frame):
-        if self.log.isEnabledFor(logging.DEBUG):
+        if self._isEnabledFor(_DEBUG):
             self.log.debug('Sending %s' % frame.info())
         self.transport.write(binaryType(frame))
 
@@ -1,4 +1,5 @@
 import logging
+import os
 
 from twisted.internet import defer, reactor
 from twisted.internet.protocol import Factory
@@ -15,11 +16,13 @@ from .broker_simulator import BlackHoleStompServer, ErrorOnConnectStompServer, E
 
 observer = log.PythonLoggingObserver()
 observer.start()
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.environ.get('STOMPEST_TEST_LOG', 'WARNING'))
 
 class AsyncClientBaseTestCase(unittest.TestCase):
     protocols = []
 
+    # per-test fixtures: trial does not run setUpClass/tearDownClass, and the
+    # listening sockets are cheap fakes anyway
     def setUp(self):
         self.connections = [self._create_connection(p) for p in self.protocols]
 
@@ -162,7 +165,7 @@ class AsyncClientReplaySubscriptionTestCase(AsyncClientBaseTestCase):
         else:
             raise Exception('Unexpected successful subscribe.')
 
-        self.assertEquals(client.session._subscriptions, {}) # check that no subscriptions have been accepted
+        self.assertEqual(client.session._subscriptions, {}) # check that no subscriptions have been accepted
         yield client.connect()
 
         self.shutdown = True # the callback handler will kill the broker connection ...
@@ -178,18 +181,18 @@ class AsyncClientReplaySubscriptionTestCase(AsyncClientBaseTestCase):
         self._got_message = defer.Deferred()
 
         yield client.connect()
-        self.assertNotEquals(client.session._subscriptions, []) # the subscriptions have been replayed ...
+        self.assertNotEqual(client.session._subscriptions, []) # the subscriptions have been replayed ...
 
         result = yield self._got_message
-        self.assertEquals(result, None) # ... and the message comes back
+        self.assertEqual(result, None) # ... and the message comes back
 
         yield client.disconnect()
         yield client.disconnected
-        self.assertEquals(list(client.session.replay()), []) # after a clean disconnect, the subscriptions are forgotten.
+        self.assertEqual(list(client.session.replay()), []) # after a clean disconnect, the subscriptions are forgotten.
 
     def _on_message(self, client, msg):
         self.assertTrue(isinstance(client, Stomp))
-        self.assertEquals(msg.body, b'hi')
+        self.assertEqual(msg.body, b'hi')
         if self.shutdown:
             client.send('/queue/fake', b'shutdown')
         else:
@@ -212,7 +215,7 @@ class AsyncClientMultiSubscriptionsTestCase(AsyncClientBaseTestCase):
             listeners.append(listener)
 
         for (j, listener) in enumerate(listeners):
-            self.assertEquals(listener._headers['bla'], j)
+            self.assertEqual(listener._headers['bla'], j)
 
         yield client.disconnect()
         yield client.disconnected
@@ -220,6 +223,20 @@ class AsyncClientMultiSubscriptionsTestCase(AsyncClientBaseTestCase):
     def _on_message(self, client, msg):
         pass
 
+class AsyncClientDoubleDisconnectTestCase(AsyncClientBaseTestCase):
+    protocols = [RemoteControlViaFrameStompServer]
+
+    @defer.inlineCallbacks
+    def test_disconnect_while_disconnecting(self):
+        port = self.connections[0].getHost().port
+        config = StompConfig(uri='tcp://localhost:%d' % port)
+        client = Stomp(config)
+        yield client.connect()
+        disconnecting = client.disconnect()
+        yield client.disconnect() # a second disconnect must be harmless ...
+        yield disconnecting # ... and must not prevent the first one from completing
+        yield client.disconnected
+
 class AsyncClientDisconnectTimeoutTestCase(AsyncClientBaseTestCase):
     protocols = [RemoteControlViaFrameStompServer]
 
@@ -264,12 +281,13 @@ class AsyncClientDisconnectTimeoutTestCase(AsyncClientBaseTestCase):
 
         self.wait.callback(None)
 
-    @defer.inlineCallbacks
     def _on_message(self, client, msg):
+        # runs once per incoming frame: returning the Deferred directly avoids the
+        # inlineCallbacks generator/trampoline overhead for a single wait
         client.nack(msg)
         self.wait = defer.Deferred()
         self._got_message.callback(None)
-        yield self.wait
+        return self.wait
 
 if __name__ == '__main__':
     import sys
@@ -1,4 +1,3 @@
-import collections
 import contextlib
 
 from twisted.internet import defer, reactor
@@ -9,20 +8,17 @@ from stompest.util import cloneFrame
 
 MESSAGE_FAILED_HEADER = 'message-failed'
 
-class InFlightOperations(collections.MutableMapping):
+class InFlightOperations(dict):
+    # a dict subclass (rather than a MutableMapping wrapper): the hot per-frame
+    # operations -- truth testing, containment, values(), lookup in _onReceipt --
+    # all run on the C implementations.
     def __init__(self, info):
+        dict.__init__(self)
         self._info = info
-        self._waiting = {}
-
-    def __len__(self):
-        return len(self._waiting)
-
-    def __iter__(self):
-        return iter(self._waiting)
 
     def __getitem__(self, key):
         try:
-            return self._waiting[key]
+            return dict.__getitem__(self, key)
         except KeyError:
             raise StompNotRunningError('%s not in progress' % self.info(key))
 
@@ -31,10 +27,7 @@ class InFlightOperations(collections.MutableMapping):
             raise StompAlreadyRunningError('%s already in progress' % self.info(key))
         if not isinstance(value, defer.Deferred):
             raise ValueError('invalid value: %s' % value)
-        self._waiting[key] = value
-
-    def __delitem__(self, key):
-        del self._waiting[key]
+        dict.__setitem__(self, key, value)
 
     @contextlib.contextmanager
     def __call__(self, key, log=None):
@@ -58,8 +51,13 @@ class InFlightOperations(collections.MutableMapping):
         return ' '.join(map(str, filter(None, (self._info, key))))
 
 class WaitingDeferred(defer.Deferred):
-    @defer.inlineCallbacks
     def wait(self, timeout=None, fail=None):
+        if self.called: # already fired: nothing to time out, no generator needed
+            return self
+        return self._wait(timeout, fail)
+
+    @defer.inlineCallbacks
+    def _wait(self, timeout, fail):
         if timeout is not None:
             timeout = reactor.callLater(timeout, self.errback, fail) # @UndefinedVariable
         try: